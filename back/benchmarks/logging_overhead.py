@@ -0,0 +1,84 @@
+"""
+Per-request logging overhead: synchronous file handler vs queue pipeline (config.logger_loader).
+Run from back/ directory:
+    python benchmarks/logging_overhead.py --requests 5000 --concurrency 100
+Only the time spent inside logging calls on the event loop thread is measured.
+"""
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config.log_tools import ContextFilter, JsonFormatter, request_id_var  # noqa: E402
+from config.logger_loader import install_queue_handlers  # noqa: E402
+
+
+def make_logger(name: str, log_dir: Path, queued: bool) -> tuple[logging.Logger, list]:
+    logger = logging.getLogger(f'bench.{name}')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = logging.handlers.RotatingFileHandler(log_dir / f'{name}.log', maxBytes=10485760, backupCount=2,
+                                                   encoding='utf-8')
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    if queued:
+        return logger, install_queue_handlers([logger])
+    handler.addFilter(ContextFilter())
+    return logger, []
+
+
+async def fake_request(logger: logging.Logger, logs_per_request: int) -> int:
+    """ :return: ns spent in logging calls """
+    request_id_var.set(uuid4().hex)
+    spent = 0
+    for i in range(logs_per_request):
+        started = time.perf_counter_ns()
+        logger.info('handled step %s of request', i)
+        spent += time.perf_counter_ns() - started
+        await asyncio.sleep(0)
+    return spent
+
+
+async def run_load(logger: logging.Logger, requests: int, concurrency: int, logs_per_request: int) -> list[int]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> int:
+        async with semaphore:
+            return await fake_request(logger, logs_per_request)
+
+    return await asyncio.gather(*(limited() for _ in range(requests)))
+
+
+def report(name: str, spent_ns: list[int], wall_sec: float, drain_sec: float):
+    spent_us = sorted(ns / 1000 for ns in spent_ns)
+    p99 = spent_us[int(len(spent_us) * 0.99) - 1]
+    print(f'{name:>6}: per request mean {statistics.mean(spent_us):7.1f} us, '
+          f'p50 {statistics.median(spent_us):7.1f} us, p99 {p99:7.1f} us, '
+          f'{len(spent_us) / wall_sec:8.0f} req/s, queue drained in {drain_sec * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Measure logging overhead per request')
+    arg_parser.add_argument('--requests', type=int, default=5000)
+    arg_parser.add_argument('--concurrency', type=int, default=100)
+    arg_parser.add_argument('--logs-per-request', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, queued in (('sync', False), ('queue', True)):
+            bench_logger, listeners = make_logger(name, Path(tmp), queued)
+            started = time.perf_counter()
+            result = asyncio.run(run_load(bench_logger, args.requests, args.concurrency, args.logs_per_request))
+            loaded = time.perf_counter()
+            for listener in listeners:
+                listener.stop()
+            report(name, result, loaded - started, time.perf_counter() - loaded)
+        logging.shutdown()
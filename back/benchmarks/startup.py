@@ -0,0 +1,69 @@
+"""
+Startup benchmark based on `python -X importtime`. Run from back/ directory:
+    python benchmarks/startup.py                  - check both entry points against budget
+    python benchmarks/startup.py --module main    - only API
+Exits with code 1 if import time is over budget or API imports crawler modules.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACK_DIR = Path(__file__).resolve().parent.parent
+
+# median cumulative import time, ms
+BUDGET_MS = {
+    'main': 700,
+    'worker': 1200,
+}
+# API workers must never load these
+API_FORBIDDEN = ('parser', 'periodic_tasks', 'httpx', 'bs4', 'apscheduler', 'zstandard')
+
+
+def measure(module: str) -> tuple[float, dict[str, int]]:
+    """ :return: total import time in ms and cumulative time (us) of every imported module """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=BACK_DIR, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f'import {module} failed:\n{proc.stderr[-2000:]}')
+
+    modules, total_us = {}, 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        modules[name.strip()] = int(cumulative)
+        if not name.startswith('  '):  # top level import
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def bench(module: str, runs: int, top: int) -> bool:
+    results = [measure(module) for _ in range(runs)]
+    median_ms = statistics.median(total for total, _ in results)
+    modules = results[-1][1]
+    budget = BUDGET_MS[module]
+    ok = median_ms <= budget
+
+    print(f'{module}: median {median_ms:.0f} ms of {runs} runs, budget {budget} ms - {"OK" if ok else "OVER BUDGET"}')
+    for name, cumulative in sorted(modules.items(), key=lambda x: -x[1])[:top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+    if module == 'main':
+        leaked = sorted(name for name in modules if name.split('.')[0] in API_FORBIDDEN)
+        if leaked:
+            print(f'  API imports crawler modules: {", ".join(leaked)}')
+            ok = False
+    return ok
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Measure import time of entry points')
+    arg_parser.add_argument('--module', choices=BUDGET_MS, action='append', help='entry point, default all')
+    arg_parser.add_argument('--runs', type=int, default=5)
+    arg_parser.add_argument('--top', type=int, default=15, help='show N slowest imports')
+    args = arg_parser.parse_args()
+
+    results = [bench(module, args.runs, args.top) for module in args.module or BUDGET_MS]
+    sys.exit(0 if all(results) else 1)
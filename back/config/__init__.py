@@ -1,2 +1,2 @@
-from .conf_loader import Config
+from .conf_loader import Config, get_config_holder
 from .logger_loader import setup_logging
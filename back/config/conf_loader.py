@@ -1,9 +1,12 @@
 import os
+from functools import lru_cache
+from typing import Literal
 
 import logging.config
 
 from pydantic import BaseModel
 
+from config.reloader import ConfigHolder
 from config.structures import ConfigBranch, ConfigBase
 
 logger = logging.getLogger(__name__)
@@ -30,12 +33,39 @@ class ParserConfig(ConfigBranch):
     news_limit: int
 
 
+class RawStoreConfig(ConfigBranch):
+    compression_level: int
+    dict_size: int  # bytes, size of trained zstd dictionary
+    dict_samples: int  # how many stored pages use for dictionary training
+    reparse_chunk_size: int
+    reparse_workers: int  # 0 - use all CPU cores
+
+
+class PipelineConfig(ConfigBranch):
+    fetch_workers: int
+    queue_size: int  # max items waiting between stages
+    batch_size: int  # enrich and persist batch
+    batch_linger_sec: float  # max wait for a full batch after its first article
+    executor: Literal['thread', 'process']  # where extract and enrichers run
+    extract_workers: int  # extract workers, size of its executor
+    enrich_workers: int  # concurrent enrich batches, size of its executor
+    enrichers: list[str]
+
+
 class Config(ConfigBase):
     """ Подключать ветки конфига (класс от ConfigBranch) сюда"""
     dev_mode: bool
 
     db: DBConfig
     parser: ParserConfig
+    raw_store: RawStoreConfig
+    pipeline: PipelineConfig
 
     def after_load(self):
         self.dev_mode = bool(os.getenv('DEV'))
+
+
+@lru_cache
+def get_config_holder() -> ConfigHolder[Config]:
+    """ Process-wide config holder, config file is read only on first call and on reload """
+    return ConfigHolder(Config)
@@ -0,0 +1,72 @@
+import copy
+import json
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+
+# set per request (API middleware) and per crawl cycle (launch_parser), asyncio tasks get their own copy
+request_id_var: ContextVar[str | None] = ContextVar('request_id', default=None)
+crawl_cycle_id_var: ContextVar[str | None] = ContextVar('crawl_cycle_id', default=None)
+
+
+class ContextFilter(logging.Filter):
+    """ Adds request_id and crawl_cycle_id to records. Must run in the logging thread, not in QueueListener """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.crawl_cycle_id = crawl_cycle_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    """ Keeps every N-th DEBUG record per logger, other levels pass as is """
+
+    def __init__(self, every: int = 1):
+        super().__init__()
+        self.every = max(every, 1)
+        self._counters: dict[str, count] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.DEBUG or self.every == 1:
+            return True
+        counter = self._counters.setdefault(record.name, count())
+        return next(counter) % self.every == 0
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a listener in the same process. Stock prepare formats the record (traceback included)
+    on the caller thread and drops exc_info, here only msg % args is merged, the rest is left to the listener
+    """
+
+    def __init__(self, queue, target_handlers: list[logging.Handler]):
+        super().__init__(queue)
+        self.target_handlers = target_handlers  # handlers of the listener, see logger_loader.use_direct_handlers
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'func': record.funcName,
+            'msg': record.getMessage(),
+        }
+        for key in ('request_id', 'crawl_cycle_id'):
+            value = getattr(record, key, None)
+            if value:
+                data[key] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
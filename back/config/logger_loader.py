@@ -1,25 +1,74 @@
+import atexit
 import logging
+import logging.config
+import logging.handlers
 from pathlib import Path
+from queue import SimpleQueue
 
 import yaml
-import logging
+
+from config.log_tools import ContextFilter, DebugSamplingFilter, LocalQueueHandler
+
+
+def _stop_listener(listener: logging.handlers.QueueListener):
+    """ QueueListener.stop fails if it is already stopped """
+    if listener._thread is not None:
+        listener.stop()
+
+
+def install_queue_handlers(loggers: list[logging.Logger],
+                           debug_sample_every: int = 1) -> list[logging.handlers.QueueListener]:
+    """
+    Move handlers of every logger to a QueueListener thread, logger itself gets only a QueueHandler.
+    So formatting and file I/O don't happen on the event loop thread.
+    Context (request_id, crawl_cycle_id) and debug sampling are applied before enqueuing.
+    Listeners are stopped (queue drained) at exit.
+    """
+    listeners = []
+    for logger in loggers:
+        if not logger.handlers:
+            continue
+        queue = SimpleQueue()
+        listener = logging.handlers.QueueListener(queue, *logger.handlers, respect_handler_level=True)
+        queue_handler = LocalQueueHandler(queue, list(logger.handlers))
+        queue_handler.addFilter(DebugSamplingFilter(debug_sample_every))
+        queue_handler.addFilter(ContextFilter())
+        logger.handlers = [queue_handler]
+        listener.start()
+        atexit.register(_stop_listener, listener)
+        listeners.append(listener)
+    return listeners
+
+
+def use_direct_handlers():
+    """
+    Initializer for forked worker processes (ProcessPoolExecutor): QueueListener threads are not forked,
+    so records put into queues are never written. Worker writes to the target handlers directly instead.
+    """
+    loggers = [logging.getLogger()] + [logger for logger in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(logger, logging.Logger)]
+    for logger in loggers:
+        for handler in list(logger.handlers):
+            if isinstance(handler, LocalQueueHandler):
+                logger.removeHandler(handler)
+                for target in handler.target_handlers:
+                    logger.addHandler(target)
 
 
 def setup_logging():
     logger = logging.getLogger(__name__)
     logger_conf_path = Path('config/logging.yaml')
     log_path = Path('logs')
-    # Отключение всех существующих логгеров
-
-    for logger in logging.Logger.manager.loggerDict.values():
-        if isinstance(logger, logging.Logger):
-            logger.disabled = True
 
     try:
         log_path.mkdir(exist_ok=True)
         with logger_conf_path.open("r", encoding='utf-8') as f:
             logging_config = yaml.safe_load(f)
+            queue_config = logging_config.pop('queue', {})
             logging.config.dictConfig(logging_config)
+        if queue_config.get('enabled'):
+            loggers = [logging.getLogger()] + [logging.getLogger(name) for name in logging_config.get('loggers', {})]
+            install_queue_handlers(loggers, queue_config.get('debug_sample_every', 1))
         logger.info("Logging configured successfully")
     except IOError:
         logging.basicConfig(level=logging.DEBUG)
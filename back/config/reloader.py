@@ -0,0 +1,68 @@
+import asyncio
+import inspect
+from logging import getLogger
+from typing import Callable, Awaitable, Generic, TypeVar
+
+from config.structures import ConfigBase
+
+logger = getLogger(__name__)
+
+ConfigT = TypeVar('ConfigT', bound=ConfigBase)
+Subscriber = Callable[[ConfigT, ConfigT], Awaitable[None] | None]
+
+
+class ConfigHolder(Generic[ConfigT]):
+    """
+    Keeps the current config snapshot. Config file is loaded once, then watched (mtime polling):
+    on change a new snapshot is built and swapped in, subscribers get (old, new) to reconfigure live.
+    Invalid file is logged and ignored, old snapshot stays.
+    """
+
+    def __init__(self, factory: Callable[[], ConfigT]):
+        self._factory = factory
+        self._current = factory()
+        self._mtime = self._read_mtime()
+        self._subscribers: list[Subscriber] = []
+
+    @property
+    def current(self) -> ConfigT:
+        return self._current
+
+    def subscribe(self, callback: Subscriber):
+        """ callback(old, new) is called after every successful reload, can be sync or async """
+        self._subscribers.append(callback)
+
+    def _read_mtime(self) -> int | None:
+        try:
+            return self._current.conf_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    async def reload(self) -> bool:
+        """ Load new snapshot and notify subscribers. :return: True if snapshot was swapped """
+        try:
+            new = self._factory()
+        except Exception:
+            logger.exception('Config reload failed, keep using previous config')
+            return False
+
+        old, self._current = self._current, new
+        changed = [name for name, branch in new.branches().items() if old.branches().get(name) != branch]
+        logger.info(f'Config reloaded, changed branches: {changed or "none"}')
+        for callback in self._subscribers:
+            try:
+                result = callback(old, new)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception(f'Config subscriber {callback!r} failed')
+        return True
+
+    async def watch(self, interval_sec: float = 5):
+        """ Poll config file mtime forever, reload on change """
+        while True:
+            await asyncio.sleep(interval_sec)
+            mtime = self._read_mtime()
+            if mtime is not None and mtime != self._mtime:
+                self._mtime = mtime
+                await self.reload()
@@ -1,7 +1,9 @@
 import os
+import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 import yaml
 
 from pydantic.functional_validators import model_validator
@@ -11,20 +13,38 @@ from typing import Self
 
 logger = getLogger(__name__)
 
+# ${VAR}, ${VAR:-default} и устаревший вариант {$VAR}
+ENV_VAR_PATTERN = re.compile(r'\$\{(\w+)(?::-([^}]*))?\}|\{\$(\w+)\}')
+
+
+def substitute_env(value: str) -> str | None:
+    """ Подставляет переменные окружения. Если значение целиком - одна переменная без default и её нет, вернёт None """
+    full_match = ENV_VAR_PATTERN.fullmatch(value)
+    if full_match:
+        name = full_match.group(1) or full_match.group(3)
+        return os.getenv(name, full_match.group(2))
+
+    def replace(match: re.Match) -> str:
+        name = match.group(1) or match.group(3)
+        return os.getenv(name, match.group(2) or '')
+
+    return ENV_VAR_PATTERN.sub(replace, value)
+
 
 class ConfigBranch(BaseModel):
     """
     Базовый класс для веток конфига с автоматической загрузкой параметров по аннотациям
-    Также берёт данные из переменных окружения, если в конфиге переменная выглядит так: ${SOME_ENV_VAR}
+    Также берёт данные из переменных окружения, если в конфиге переменная выглядит так: ${SOME_ENV_VAR},
+    ${SOME_ENV_VAR:-default} или {$SOME_ENV_VAR}. Ветки неизменяемы (frozen)
     """
+    model_config = ConfigDict(frozen=True)
 
     @model_validator(mode='before')
     @classmethod
     def check_data(cls, data: dict) -> dict:
         for key, value in data.items():
-            if isinstance(value, str) and value.startswith('{$') and value.endswith('}'):
-                param_name = value.lstrip('{$').rstrip('}')
-                data[key] = os.getenv(param_name)
+            if isinstance(value, str) and ('${' in value or '{$' in value):
+                data[key] = substitute_env(value)
         return data
 
     @model_validator(mode='after')
@@ -34,11 +54,16 @@ class ConfigBranch(BaseModel):
 
     def after_load(self):
         # Переопределить если нужны дополнительные действия с конфигом
+        # Ветка frozen, менять поля только через object.__setattr__
         pass
 
 
 @dataclass
 class ConfigBase:
+    """
+    Снимок конфига. После загрузки (и after_load) изменять нельзя - для новых значений
+    создаётся новый снимок, см. config.reloader.ConfigHolder
+    """
     conf_path_prod: Path = Path("config/config.yaml")
     conf_path_dev: Path = Path("config/config.dev.yaml")
 
@@ -47,13 +72,13 @@ class ConfigBase:
         pass
 
     def __init__(self):
+        started = time.perf_counter()
         if os.getenv('DEV'):
             self.conf_path = self.conf_path_dev
             logger.warning('=== CONFIG LOADING IN DEV MODE ===')
         else:
             self.conf_path = self.conf_path_prod
 
-
         with open(self.conf_path, 'r', encoding='utf-8') as f:
             config_dct = yaml.safe_load(f)
 
@@ -61,3 +86,14 @@ class ConfigBase:
                 if issubclass(config_branch, ConfigBranch):
                     self.__setattr__(attr, config_branch.model_validate(config_dct[attr]))
         self.after_load()
+        self._frozen = True
+        logger.debug(f'Config loaded from {self.conf_path} in {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    def __setattr__(self, key, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'Config is immutable, can not set {key!r}')
+        super().__setattr__(key, value)
+
+    def branches(self) -> dict[str, ConfigBranch]:
+        return {attr: getattr(self, attr) for attr, branch in self.__annotations__.items()
+                if issubclass(branch, ConfigBranch)}
@@ -31,3 +31,8 @@ def create_pool(db_config: DBConfig) -> async_sessionmaker[AsyncSession]:
         autocommit=False,
     )
     return pool
+
+
+async def dispose_pool(pool: async_sessionmaker[AsyncSession]):
+    """ Close idle connections of the pool engine, checked out ones are closed on release """
+    await pool.kw['bind'].dispose()
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.dao.base import BaseDAO
-from db.dao.parser import NewsDAO
+from db.dao.parser import NewsDAO, RawPageDAO, CompressionDictDAO
+from db.dao.stats import HourlyNewsStatsDAO, HourlyTermCountDAO
 
 
 class HolderDao:
@@ -11,6 +12,10 @@ class HolderDao:
         self.session = session
 
         self.news = NewsDAO(session)
+        self.raw_page = RawPageDAO(session)
+        self.compression_dict = CompressionDictDAO(session)
+        self.hourly_news = HourlyNewsStatsDAO(session)
+        self.hourly_terms = HourlyTermCountDAO(session)
 
     async def commit(self):
         await self.session.commit()
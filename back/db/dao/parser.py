@@ -1,9 +1,81 @@
+from datetime import datetime
+
+from sqlalchemy import select, update, insert, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.dao.base import BaseDAO
-from db.models import News
+from db.models import News, RawPage, CompressionDict
 
 
 class NewsDAO(BaseDAO[News]):
     def __init__(self, session: AsyncSession):
         super().__init__(News, session)
+
+    async def get_stats_state(self, news_ids: list[int]) -> dict[int, tuple[datetime, dict | None]]:
+        """ :return: {news_id: (parsed_at, enrichment)}, what hourly aggregates were counted from """
+        result = await self.session.execute(
+            select(News.news_id, News.parsed_at, News.enrichment).where(News.news_id.in_(news_ids))
+        )
+        return {news_id: (parsed_at, enrichment) for news_id, parsed_at, enrichment in result.all()}
+
+    async def bulk_save_by_news_id(self, rows: list[dict], existing: set[int] = None) -> tuple[int, int]:
+        """
+        Update existing news by news_id in one executemany, insert the missing ones
+
+        :param rows: dicts with news_id, title, image, text and enrichment (and parsed_at for inserted ones)
+        :param existing: news_ids already in db, queried if not passed
+        :return: (updated, inserted)
+        """
+        if not rows:
+            return 0, 0
+        if existing is None:
+            existing = set(await self.get_many(News.news_id.in_([row['news_id'] for row in rows]),
+                                               get_only=News.news_id))
+        to_update = [{'b_news_id': row['news_id'], 'title': row['title'], 'image': row['image'], 'text': row['text'],
+                      'enrichment': row['enrichment']}
+                     for row in rows if row['news_id'] in existing]
+        to_insert = [row for row in rows if row['news_id'] not in existing]
+
+        table = News.__table__
+        if to_update:
+            await self.session.execute(update(table).where(table.c.news_id == bindparam('b_news_id')), to_update)
+        if to_insert:
+            await self.session.execute(insert(table), to_insert)
+        return len(to_update), len(to_insert)
+
+
+class RawPageDAO(BaseDAO[RawPage]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(RawPage, session)
+
+    async def save_pages(self, rows: list[dict]):
+        """ Insert pages in one executemany, same content (hash) is stored only once """
+        if not rows:
+            return
+        stmt = pg_insert(RawPage.__table__).on_conflict_do_nothing(index_elements=['hash'])
+        await self.session.execute(stmt, rows)
+
+    async def get_latest_pages(self, after_news_id: int, limit: int, since: datetime = None) -> list[RawPage]:
+        """
+        Latest capture for every news_id, keyset-paginated by news_id
+
+        :param after_news_id: return only news with news_id greater than this
+        :param limit: max number of pages
+        :param since: skip captures fetched before this moment
+        """
+        stmt = select(RawPage).where(RawPage.news_id > after_news_id)
+        if since:
+            stmt = stmt.where(RawPage.fetched_at >= since)
+        stmt = (
+            stmt.distinct(RawPage.news_id)
+            .order_by(RawPage.news_id, RawPage.fetched_at.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+
+class CompressionDictDAO(BaseDAO[CompressionDict]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(CompressionDict, session)
@@ -0,0 +1,96 @@
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import select, func, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.dao.base import BaseDAO
+from db.models import HourlyNewsStats, HourlyTermCount
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def keyword_counts(articles: Iterable[tuple[datetime, dict | None]], sign: int = 1) -> Counter:
+    """
+    Keyword counts for HourlyTermCountDAO.increment
+
+    :param articles: (parsed_at, enrichment) of every article
+    :param sign: -1 to remove articles from aggregates
+    :return: {(bucket, term): count}
+    """
+    counts = Counter()
+    for parsed_at, enrichment in articles:
+        for term in set((enrichment or {}).get('keywords', [])):
+            counts[(hour_bucket(parsed_at), term)] += sign
+    return counts
+
+
+class HourlyNewsStatsDAO(BaseDAO[HourlyNewsStats]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(HourlyNewsStats, session)
+
+    async def increment(self, counts: dict[datetime, int]):
+        """ Add articles to hour buckets, creates missing buckets. Doesn't commit """
+        if not counts:
+            return
+        table = HourlyNewsStats.__table__
+        stmt = pg_insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=['bucket'],
+                                          set_={'articles': table.c.articles + stmt.excluded.articles})
+        await self.session.execute(stmt, [{'bucket': bucket, 'articles': articles}
+                                          for bucket, articles in sorted(counts.items())])
+
+    async def get_since(self, since: datetime) -> list[HourlyNewsStats]:
+        return await self.get_many(HourlyNewsStats.bucket >= since, order_by=HourlyNewsStats.bucket)
+
+
+class HourlyTermCountDAO(BaseDAO[HourlyTermCount]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(HourlyTermCount, session)
+
+    async def increment(self, counts: dict[tuple[datetime, str], int]):
+        """
+        Add term counts to hour buckets. Doesn't commit
+
+        :param counts: {(bucket, term): count}, count can be negative
+        """
+        counts = {key: count for key, count in counts.items() if count}
+        if not counts:
+            return
+        table = HourlyTermCount.__table__
+        stmt = pg_insert(table)
+        stmt = stmt.on_conflict_do_update(index_elements=['bucket', 'term'],
+                                          set_={'count': table.c['count'] + stmt.excluded['count']})
+        # sorted, so concurrent transactions lock rows in the same order
+        await self.session.execute(stmt, [{'bucket': bucket, 'term': term, 'count': count}
+                                          for (bucket, term), count in sorted(counts.items())])
+
+    async def get_top_terms(self, since: datetime, limit: int, until: datetime = None) -> list[tuple[str, int]]:
+        total = func.sum(HourlyTermCount.count).label('total')
+        stmt = select(HourlyTermCount.term, total).where(HourlyTermCount.bucket >= since)
+        if until:
+            stmt = stmt.where(HourlyTermCount.bucket < until)
+        # reparse can bring counts down to 0, such terms are not trending
+        stmt = (
+            stmt.group_by(HourlyTermCount.term)
+            .having(total > 0)
+            .order_by(desc(total), HourlyTermCount.term)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(term, count) for term, count in result.all()]
+
+    async def get_term_counts(self, terms: list[str], since: datetime, until: datetime) -> dict[str, int]:
+        stmt = (
+            select(HourlyTermCount.term, func.sum(HourlyTermCount.count))
+            .where(HourlyTermCount.term.in_(terms),
+                   HourlyTermCount.bucket >= since,
+                   HourlyTermCount.bucket < until)
+            .group_by(HourlyTermCount.term)
+        )
+        result = await self.session.execute(stmt)
+        return {term: count for term, count in result.all()}
@@ -1 +1,2 @@
 from .parser import *
+from .stats import *
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, ForeignKey, JSON
 
 from db.base import Base
 
@@ -13,4 +13,28 @@ class News(Base):
     title = Column(String, nullable=False)
     image = Column(String, nullable=True)
     text = Column(String, nullable=False)
-    parsed_at = Column(DateTime, default=datetime.now())
+    parsed_at = Column(DateTime, default=datetime.now)
+    enrichment = Column(JSON, nullable=True)  # results of parser.enrichers, e.g. language, keywords
+
+
+class CompressionDict(Base):
+    """ Trained zstd dictionary. Pages compressed with it keep a reference in RawPage.dict_id """
+    __tablename__ = "compression_dicts"
+
+    id = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    samples = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class RawPage(Base):
+    """ Fetched HTML of news page, zstd compressed. Content addressed by sha256 of the source HTML """
+    __tablename__ = "raw_pages"
+
+    id = Column(Integer, primary_key=True)
+    hash = Column(String(64), nullable=False, unique=True)
+    news_id = Column(Integer, nullable=False, index=True)
+    uri = Column(String, nullable=False)
+    content = Column(LargeBinary, nullable=False)
+    dict_id = Column(Integer, ForeignKey('compression_dicts.id'), nullable=True)
+    fetched_at = Column(DateTime, default=datetime.now)
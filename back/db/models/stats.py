@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+
+from db.base import Base
+
+
+class HourlyNewsStats(Base):
+    """ Articles count per hour, maintained at ingest (parser.pipeline persist stage) """
+    __tablename__ = "hourly_news_stats"
+
+    bucket = Column(DateTime, primary_key=True)  # start of the hour
+    articles = Column(Integer, nullable=False, default=0)
+
+
+class HourlyTermCount(Base):
+    """ Keyword counts per hour: in how many articles of the hour the keyword was found """
+    __tablename__ = "hourly_term_counts"
+
+    bucket = Column(DateTime, primary_key=True)
+    term = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
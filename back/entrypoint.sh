@@ -1,7 +1,17 @@
 #!/bin/bash
+# usage: entrypoint.sh [api|worker], api by default
 
-# migrations
-alembic upgrade head
+if [ "$1" = "worker" ]; then
+  # migrations are made by api container, wait until db schema is at head
+  until alembic current 2>/dev/null | grep -q "(head)"; do
+    echo "waiting for migrations..."
+    sleep 2
+  done
+  python worker.py
+else
+  # migrations
+  alembic upgrade head
 
-sleep 5
-python main.py
+  sleep 5
+  python main.py
+fi
@@ -1,21 +1,31 @@
-from typing import Union
+""" API entry point. Crawler runs separately (worker.py), don't import parser modules here """
+import time
 
-from fastapi import FastAPI, Request, HTTPException, Depends
-from sqlalchemy import desc, select
+_started = time.perf_counter()
+
+import asyncio
+from datetime import datetime, timedelta
+from logging import getLogger
+from uuid import uuid4
+
+from fastapi import FastAPI, Request, Depends, Query
 from starlette.middleware.cors import CORSMiddleware
-from uvicorn import run
 
-from config import Config, setup_logging
+from config import Config, setup_logging, get_config_holder
+from config.log_tools import request_id_var
 from db import News
-from db.base import create_pool
+from db.base import create_pool, dispose_pool
 from db.dao import HolderDao
-from periodic_tasks import init_scheduler
+from db.dao.stats import hour_bucket
+
+logger = getLogger(__name__)
+_imported = time.perf_counter()
 
 app = FastAPI()
 
 
 def get_config(request: Request) -> Config:
-    return request.app.state.config
+    return request.app.state.config_holder.current
 
 
 def get_dao(request: Request) -> HolderDao:
@@ -27,8 +37,7 @@ async def add_dao_and_config_middleware(request: Request, call_next):
     """ Adds dao to request, wraps fastapi functions in a context manager.
     Get it like this: dao: HolderDao = request.state.dao
     """
-    pool = create_pool(app.state.config.db)
-    async with pool() as session:
+    async with app.state.pool() as session:
         dao = HolderDao(session)
         request.state.dao = dao
         response = await call_next(request)
@@ -36,6 +45,19 @@ async def add_dao_and_config_middleware(request: Request, call_next):
         return response
 
 
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """ Sets request id for logs, takes it from X-Request-ID header if there is one """
+    request_id = request.headers.get('X-Request-ID') or uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers['X-Request-ID'] = request_id
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -61,13 +83,47 @@ async def get_news(limit: int = 5,
     ]
 
 
+@app.get("/api/stats")
+async def get_stats(hours: int = Query(24, ge=1, le=24 * 30),
+                    top: int = Query(20, ge=1, le=100),
+                    dao: HolderDao = Depends(get_dao)):
+    """ Articles per hour and trending keywords, read from precomputed hourly aggregates """
+    now = hour_bucket(datetime.now())
+    since = now - timedelta(hours=hours - 1)
+    previous_since = since - timedelta(hours=hours)
+
+    per_hour = await dao.hourly_news.get_since(since)
+    top_terms = await dao.hourly_terms.get_top_terms(since, limit=top)
+    previous = await dao.hourly_terms.get_term_counts([term for term, _ in top_terms], previous_since, since)
+    return {
+        'articles_per_hour': [{'hour': item.bucket, 'articles': item.articles} for item in per_hour],
+        'trending': [{'term': term, 'count': count, 'previous_count': previous.get(term, 0)}
+                     for term, count in top_terms],
+    }
+
+
+async def on_config_change(old: Config, new: Config):
+    """ Recreate db pool if db settings changed, requests in flight finish on the old one """
+    if old.db != new.db:
+        old_pool, app.state.pool = app.state.pool, create_pool(new.db)
+        await dispose_pool(old_pool)
+        logger.info('API db pool recreated')
+
+
 @app.on_event("startup")
-def startup_event():
-    config = Config()
-    init_scheduler(config=config)
-    app.state.config = config
+async def startup_event():
+    config_started = time.perf_counter()
+    config_holder = get_config_holder()
+    app.state.config_holder = config_holder
+    app.state.pool = create_pool(config_holder.current.db)
+    config_holder.subscribe(on_config_change)
+    app.state.config_watcher = asyncio.create_task(config_holder.watch())
+    logger.info(f'Startup: imports {(_imported - _started) * 1000:.0f} ms, '
+                f'config and pools {(time.perf_counter() - config_started) * 1000:.0f} ms')
 
 
 if __name__ == '__main__':
+    from uvicorn import run
+
     setup_logging()
     run(app, host="0.0.0.0", port=5000)
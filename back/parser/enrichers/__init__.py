@@ -0,0 +1,2 @@
+from .base import Enricher, register_enricher, load_enrichers, ENRICHERS
+from . import basic
@@ -0,0 +1,29 @@
+class Enricher:
+    """
+    Base class for article enrichers. Plug in a new one with @register_enricher and add its name
+    to pipeline.enrichers in config.
+    enrich_batch runs in a thread or process pool, so enricher must be picklable and must not touch db or network.
+    """
+    name: str
+
+    def enrich_batch(self, articles: list[dict]) -> list[dict]:
+        """
+        :param articles: dicts with title, image and text
+        :return: one dict per article, merged into News.enrichment
+        """
+        raise NotImplementedError
+
+
+ENRICHERS: dict[str, type[Enricher]] = {}
+
+
+def register_enricher(cls: type[Enricher]) -> type[Enricher]:
+    ENRICHERS[cls.name] = cls
+    return cls
+
+
+def load_enrichers(names: list[str]) -> list[Enricher]:
+    unknown = [name for name in names if name not in ENRICHERS]
+    if unknown:
+        raise ValueError(f'Unknown enrichers: {unknown}, available: {list(ENRICHERS)}')
+    return [ENRICHERS[name]() for name in names]
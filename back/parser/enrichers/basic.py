@@ -0,0 +1,68 @@
+import re
+from collections import Counter
+
+from parser.enrichers.base import Enricher, register_enricher
+
+WORD_PATTERN = re.compile(r'[^\W\d_][\w-]*')  # no apostrophes: "armenia's" counts as "armenia"
+STOP_WORDS = frozenset('''
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or other
+our out over own said same says she should so some such than that the their them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with would
+you your according told year years new one two three also per since within
+don doesn didn isn wasn aren weren won wouldn couldn shouldn hasn haven hadn
+'''.split())
+
+
+def words(text: str) -> list[str]:
+    return [word.lower() for word in WORD_PATTERN.findall(text)]
+
+
+@register_enricher
+class ReadingTimeEnricher(Enricher):
+    name = 'reading_time'
+    words_per_minute = 200
+
+    def enrich_batch(self, articles: list[dict]) -> list[dict]:
+        return [{'reading_time_sec': round(len(words(article['text'])) * 60 / self.words_per_minute)}
+                for article in articles]
+
+
+@register_enricher
+class LanguageEnricher(Enricher):
+    """ Detects language by script of letters: Armenian, Cyrillic or Latin """
+    name = 'language'
+    scripts = {
+        'hy': re.compile('[\u0531-\u058f]'),
+        'ru': re.compile('[\u0400-\u04ff]'),
+        'en': re.compile('[A-Za-z]'),
+    }
+
+    def enrich_batch(self, articles: list[dict]) -> list[dict]:
+        result = []
+        for article in articles:
+            sample = article['title'] + ' ' + article['text'][:2000]
+            counts = {lang: len(pattern.findall(sample)) for lang, pattern in self.scripts.items()}
+            lang = max(counts, key=counts.get)
+            result.append({'language': lang if counts[lang] else None})
+        return result
+
+
+@register_enricher
+class KeywordsEnricher(Enricher):
+    """ Most frequent words without stop words, title words count twice """
+    name = 'keywords'
+    limit = 10
+    min_length = 3
+
+    def enrich_batch(self, articles: list[dict]) -> list[dict]:
+        result = []
+        for article in articles:
+            counter = Counter(self._terms(article['text']))
+            counter.update(self._terms(article['title']) * 2)
+            result.append({'keywords': [term for term, _ in counter.most_common(self.limit)]})
+        return result
+
+    def _terms(self, text: str) -> list[str]:
+        return [word for word in words(text) if len(word) >= self.min_length and word not in STOP_WORDS]
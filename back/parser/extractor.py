@@ -0,0 +1,45 @@
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+
+class ExtractionError(Exception):
+    """ Page markup doesn't match the expected news.am structure """
+
+
+def extract_news(html: str, main_uri: str) -> dict:
+    """
+    Extract title, image and text from news page. Pure function, so it can be run in a process pool
+
+    :param html: page HTML
+    :param main_uri: site main uri, used to make absolute image links
+    :return: dict with title, image and text
+    :raises ExtractionError: if some of required blocks not found or empty
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    title_el = soup.find('div', class_='article-title')
+    news_block = soup.find('div', class_='article-text')
+    if not title_el or not news_block:
+        raise ExtractionError('article-title or article-text block not found')
+
+    img_el = news_block.find('img')
+    if img_el and img_el.get('src'):
+        domain = f"https://{urlparse(main_uri).netloc}"
+        img_link = urljoin(domain, img_el['src'])
+    else:
+        img_link = None
+
+    text_el = news_block.find("span", class_="article-body")
+    if not text_el:
+        raise ExtractionError('article-body block not found')
+
+    title = title_el.text.strip()
+    article_text = ' '.join(p.get_text(strip=True) for p in text_el.find_all("p"))
+    if not title or not article_text:
+        raise ExtractionError('empty title or text')
+
+    return {
+        'title': title,
+        'image': img_link,
+        'text': article_text,
+    }
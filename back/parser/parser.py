@@ -1,24 +1,29 @@
 import re
 from logging import getLogger
-from urllib.parse import urljoin, urlparse
+from uuid import uuid4
 
 import httpx
 from bs4 import BeautifulSoup
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from config import Config
+from config.log_tools import crawl_cycle_id_var
 from db.base import create_pool
 from db.dao import HolderDao
 from db.models import News
+from parser.pipeline import ArticlePipeline
+from parser.raw_store import RawHtmlStore
 
 logger = getLogger(__name__)
 
 
 class Parser:
-    def __init__(self, config: Config, dao: HolderDao, http_client: AsyncClient):
+    def __init__(self, config: Config, dao: HolderDao, http_client: AsyncClient, raw_store: RawHtmlStore):
         self.config = config
         self.dao = dao
         self.http_client = http_client
+        self.raw_store = raw_store
 
     async def run(self):
         logger.info('Parsing started!')
@@ -28,9 +33,13 @@ class Parser:
             logger.info('There are no new news!')
             return
 
-        for news_id in news_ids:
-            await self._parse_and_save_news_by_id(news_id)
-        logger.info(f'Parsing complete! New news: {len(news_ids)}')
+        pipeline = ArticlePipeline(config=self.config.pipeline,
+                                   parser_config=self.config.parser,
+                                   dao=self.dao,
+                                   http_client=self.http_client,
+                                   raw_store=self.raw_store)
+        saved = await pipeline.run(news_ids)
+        logger.info(f'Parsing complete! New news: {saved} of {len(news_ids)}')
 
     async def _parse_last_news_ids(self) -> list[int]:
         """ find and return ids for the last news """
@@ -58,38 +67,17 @@ class Parser:
         old_ids = await self.dao.news.get_many(News.news_id.in_(news_ids), get_only=News.news_id)
         return [x for x in news_ids if x not in old_ids]
 
-    async def _parse_and_save_news_by_id(self, news_id: int):
-        uri = self.config.parser.news_uri.format(id=news_id)
-        response = await self.http_client.get(uri)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        title = soup.find('div', class_='article-title').text.strip()
-        news_block = soup.find('div', class_='article-text')
-        img_el = news_block.find('img')
-        if img_el:
-            domain = f"https://{urlparse(self.config.parser.main_uri).netloc}"
-            img_link = urljoin(domain, img_el['src'])
-        else:
-            img_link = None
-
-        text_el = news_block.find("span", class_="article-body")
-        article_text = ' '.join(p.get_text(strip=True) for p in text_el.find_all("p"))
-        news = News(
-            news_id=news_id,
-            title=title,
-            image=img_link,
-            text=article_text
-        )
-        self.dao.session.add(news)
-
 
-async def launch_parser(config: Config):
+async def launch_parser(config: Config, pool: async_sessionmaker[AsyncSession] = None):
     """ Init and launches parser, makes commit at the end of parsing """
-    pool = create_pool(config.db)
+    crawl_cycle_id_var.set(uuid4().hex[:12])
+    pool = pool or create_pool(config.db)
     async with httpx.AsyncClient(timeout=10) as http_client:
         async with pool() as db_session:
+            dao = HolderDao(db_session)
             parser = Parser(config=config,
-                            dao=HolderDao(db_session),
-                            http_client=http_client)
+                            dao=dao,
+                            http_client=http_client,
+                            raw_store=await RawHtmlStore.load(config.raw_store, dao))
             await parser.run()
             await db_session.commit()
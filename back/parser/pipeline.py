@@ -0,0 +1,286 @@
+import asyncio
+import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from logging import getLogger
+
+from httpx import AsyncClient
+
+from config.conf_loader import PipelineConfig, ParserConfig
+from config.logger_loader import use_direct_handlers
+from db.dao import HolderDao
+from db.dao.stats import hour_bucket, keyword_counts
+from db.models import News
+from parser.enrichers import Enricher, load_enrichers
+from parser.extractor import extract_news, ExtractionError
+from parser.raw_store import RawHtmlStore
+
+logger = getLogger(__name__)
+
+_DONE = object()  # end of stream marker
+
+
+@dataclass
+class Article:
+    news_id: int
+    uri: str
+    html: str | None = None
+    raw_row: dict | None = None  # compressed page for raw_pages, made in extract stage
+    extracted: dict | None = None  # None if extraction failed, only raw html is saved then
+    enrichment: dict = field(default_factory=dict)
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_sec: float = 0
+    max_queue_depth: int = 0
+    _depth_sum: int = 0
+    _depth_samples: int = 0
+
+    def observe_queue(self, depth: int):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_sum += depth
+        self._depth_samples += 1
+
+    @property
+    def throughput(self) -> float:
+        """ items per second of busy time of one worker """
+        return self.processed / self.busy_sec if self.busy_sec else 0
+
+    def __str__(self):
+        avg_depth = self._depth_sum / self._depth_samples if self._depth_samples else 0
+        return (f'{self.name}: processed {self.processed}, failed {self.failed}, workers {self.workers}, '
+                f'busy {self.busy_sec:.2f} s, {self.throughput:.1f} items/s, '
+                f'queue depth avg {avg_depth:.1f} max {self.max_queue_depth}')
+
+
+_worker_raw_store: RawHtmlStore | None = None  # set in extract worker processes by _init_extract_worker
+
+
+def _init_extract_worker(raw_store: RawHtmlStore):
+    global _worker_raw_store
+    use_direct_handlers()
+    _worker_raw_store = raw_store
+
+
+def _extract_page(raw_store: RawHtmlStore | None, news_id: int, uri: str, html: str,
+                  main_uri: str) -> tuple[dict, dict | None, str | None]:
+    """
+    CPU part of extract stage, runs in executor: compress and hash the page, extract news from it
+
+    :param raw_store: store to use, None in worker processes (set by _init_extract_worker)
+    :return: raw_pages row, extracted fields (None if failed) and error text
+    """
+    row = (raw_store or _worker_raw_store).make_row(news_id, uri, html)
+    try:
+        return row, extract_news(html, main_uri), None
+    except ExtractionError as e:
+        return row, None, str(e)
+    except Exception:
+        return row, None, traceback.format_exc()
+
+
+def _run_enricher(enricher: Enricher, articles: list[dict]) -> list[dict]:
+    """ Module level, so it can be sent to a process pool """
+    return enricher.enrich_batch(articles)
+
+
+class ArticlePipeline:
+    """
+    fetch -> extract -> enrich -> persist, stages are connected by bounded queues.
+    Each stage has its own number of workers (see pipeline config), extract and enrich run in own executors,
+    enrich and persist work with batches. Persist is the only stage that uses db session.
+    """
+
+    def __init__(self, config: PipelineConfig, parser_config: ParserConfig, dao: HolderDao,
+                 http_client: AsyncClient, raw_store: RawHtmlStore):
+        self.config = config
+        self.parser_config = parser_config
+        self.dao = dao
+        self.http_client = http_client
+        self.raw_store = raw_store
+        self.enrichers = load_enrichers(config.enrichers)
+        self.metrics = {
+            'fetch': StageMetrics('fetch', config.fetch_workers),
+            'extract': StageMetrics('extract', config.extract_workers),
+            'enrich': StageMetrics('enrich', config.enrich_workers),
+            'persist': StageMetrics('persist', 1),  # db session can't be shared
+        }
+        self._executors: dict[str, Executor] = {}
+        self.saved = 0
+
+    def _make_executor(self, stage: str) -> Executor:
+        workers = self.metrics[stage].workers
+        if self.config.executor == 'process' and stage == 'extract':
+            return ProcessPoolExecutor(max_workers=workers, initializer=_init_extract_worker,
+                                       initargs=(self.raw_store,))
+        if self.config.executor == 'process':
+            return ProcessPoolExecutor(max_workers=workers, initializer=use_direct_handlers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'pipeline_{stage}')
+
+    async def run(self, news_ids: list[int]) -> int:
+        """ :return: number of saved news """
+        queues = {name: asyncio.Queue(maxsize=self.config.queue_size) for name in self.metrics}
+        self._executors = {stage: self._make_executor(stage) for stage in ('extract', 'enrich')}
+        with self._executors['extract'], self._executors['enrich']:
+            await asyncio.gather(
+                self._feed(news_ids, queues['fetch']),
+                self._item_stage('fetch', self._fetch, queues['fetch'], queues['extract']),
+                self._item_stage('extract', self._extract, queues['extract'], queues['enrich']),
+                self._batch_stage('enrich', self._enrich, queues['enrich'], queues['persist']),
+                self._batch_stage('persist', self._persist, queues['persist'], None),
+            )
+        for metrics in self.metrics.values():
+            logger.info(str(metrics))
+        return self.saved
+
+    async def _feed(self, news_ids: list[int], outbox: asyncio.Queue):
+        for news_id in news_ids:
+            await outbox.put(Article(news_id=news_id, uri=self.parser_config.news_uri.format(id=news_id)))
+        for _ in range(self.metrics['fetch'].workers):
+            await outbox.put(_DONE)
+
+    async def _finish(self, name: str, outbox: asyncio.Queue | None):
+        """ Stage is done, stop every worker of the next one """
+        if outbox is None:
+            return
+        stages = list(self.metrics)
+        next_stage = stages[stages.index(name) + 1]
+        for _ in range(self.metrics[next_stage].workers):
+            await outbox.put(_DONE)
+
+    async def _item_stage(self, name: str, handler, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        metrics = self.metrics[name]
+
+        async def worker():
+            while (article := await inbox.get()) is not _DONE:
+                metrics.observe_queue(inbox.qsize())
+                started = time.perf_counter()
+                try:
+                    article = await handler(article)
+                except Exception:
+                    metrics.failed += 1
+                    logger.exception(f'Stage {name} failed on news {article.news_id}')
+                    continue
+                finally:
+                    metrics.busy_sec += time.perf_counter() - started
+                metrics.processed += 1
+                await outbox.put(article)
+
+        await asyncio.gather(*(worker() for _ in range(metrics.workers)))
+        await self._finish(name, outbox)
+
+    async def _get_batch(self, inbox: asyncio.Queue, metrics: StageMetrics) -> tuple[list[Article], bool]:
+        """
+        Wait for a full batch, but not longer than batch_linger_sec after its first article.
+        :return: batch and True if upstream is done
+        """
+        loop = asyncio.get_running_loop()
+        batch, deadline = [], None
+        while len(batch) < self.config.batch_size:
+            timeout = deadline - loop.time() if deadline else None
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                article = await asyncio.wait_for(inbox.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if article is _DONE:
+                return batch, True
+            metrics.observe_queue(inbox.qsize())
+            batch.append(article)
+            deadline = deadline or loop.time() + self.config.batch_linger_sec
+        return batch, False
+
+    async def _batch_stage(self, name: str, handler, inbox: asyncio.Queue, outbox: asyncio.Queue | None):
+        metrics = self.metrics[name]
+
+        async def worker():
+            done = False
+            while not done:
+                batch, done = await self._get_batch(inbox, metrics)
+                if not batch:
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    batch = await handler(batch)
+                except Exception:
+                    metrics.failed += len(batch)
+                    logger.exception(f'Stage {name} failed on news {[article.news_id for article in batch]}')
+                    continue
+                finally:
+                    metrics.busy_sec += time.perf_counter() - started
+                metrics.processed += len(batch)
+                if outbox is not None:
+                    for article in batch:
+                        await outbox.put(article)
+
+        await asyncio.gather(*(worker() for _ in range(metrics.workers)))
+        await self._finish(name, outbox)
+
+    async def _fetch(self, article: Article) -> Article:
+        response = await self.http_client.get(article.uri)
+        response.raise_for_status()
+        article.html = response.text
+        return article
+
+    async def _extract(self, article: Article) -> Article:
+        loop = asyncio.get_running_loop()
+        raw_store = None if self.config.executor == 'process' else self.raw_store
+        article.raw_row, article.extracted, error = await loop.run_in_executor(
+            self._executors['extract'], _extract_page,
+            raw_store, article.news_id, article.uri, article.html, self.parser_config.main_uri
+        )
+        article.html = None  # page is in raw_row now
+        if error:
+            logger.error(f'Failed to extract news {article.news_id}, raw HTML will be saved, '
+                         f'fix extractor and run reparse. Error: {error.strip()}')
+        return article
+
+    async def _enrich(self, batch: list[Article]) -> list[Article]:
+        """ Best effort: a failed enricher only leaves its keys out, the batch always goes to persist """
+        extracted = [article for article in batch if article.extracted]
+        if not extracted or not self.enrichers:
+            return batch
+        loop = asyncio.get_running_loop()
+        payload = [article.extracted for article in extracted]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._executors['enrich'], _run_enricher, enricher, payload)
+            for enricher in self.enrichers
+        ), return_exceptions=True)
+        for enricher, enricher_results in zip(self.enrichers, results):
+            if isinstance(enricher_results, Exception):
+                logger.error(f'Enricher {enricher.name} failed on news {[article.news_id for article in extracted]}',
+                             exc_info=enricher_results)
+                continue
+            for article, enrichment in zip(extracted, enricher_results):
+                article.enrichment.update(enrichment)
+        return batch
+
+    async def _persist(self, batch: list[Article]) -> list[Article]:
+        """ Every batch in its own savepoint: a failed one is rolled back, the rest of the crawl is committed """
+        parsed_at = datetime.now()
+        news = [News(news_id=article.news_id,
+                     parsed_at=parsed_at,
+                     enrichment=article.enrichment,
+                     **article.extracted)
+                for article in batch if article.extracted]
+        async with self.dao.session.begin_nested():
+            await self.dao.raw_page.save_pages([article.raw_row for article in batch])
+            self.dao.session.add_all(news)
+            await self._update_stats(news, parsed_at)
+            await self.dao.session.flush()
+        self.saved += len(news)
+        return batch
+
+    async def _update_stats(self, news: list[News], parsed_at: datetime):
+        """ Hourly aggregates for /api/stats, in the same transaction as news """
+        await self.dao.hourly_news.increment({hour_bucket(parsed_at): len(news)} if news else {})
+        await self.dao.hourly_terms.increment(keyword_counts((parsed_at, item.enrichment) for item in news))
@@ -0,0 +1,108 @@
+import hashlib
+import threading
+from logging import getLogger
+
+import zstandard as zstd
+
+from config.conf_loader import RawStoreConfig
+from db.dao import HolderDao
+from db.models import CompressionDict
+
+logger = getLogger(__name__)
+
+
+class RawHtmlStore:
+    """
+    Content-addressed storage of fetched pages (table raw_pages).
+    HTML is compressed with zstd, using the latest trained dictionary if there is one.
+    Dictionaries live in compression_dicts and are never changed, so old pages stay readable.
+    zstd (de)compressors can't be shared between threads, so they are cached per thread.
+    """
+
+    def __init__(self, config: RawStoreConfig, dicts: dict[int, bytes] = None):
+        self.config = config
+        self.dicts = dicts or {}
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        # sent to worker processes without (de)compressors
+        return {'config': self.config, 'dicts': self.dicts}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['config'], state['dicts'])
+
+    @property
+    def _compressors(self) -> dict[int | None, zstd.ZstdCompressor]:
+        if not hasattr(self._local, 'compressors'):
+            self._local.compressors = {}
+        return self._local.compressors
+
+    @property
+    def _decompressors(self) -> dict[int | None, zstd.ZstdDecompressor]:
+        if not hasattr(self._local, 'decompressors'):
+            self._local.decompressors = {}
+        return self._local.decompressors
+
+    @classmethod
+    async def load(cls, config: RawStoreConfig, dao: HolderDao) -> 'RawHtmlStore':
+        """ Create store with all known dictionaries """
+        dicts = await dao.compression_dict.get_all()
+        return cls(config, {d.id: d.data for d in dicts})
+
+    @property
+    def current_dict_id(self) -> int | None:
+        return max(self.dicts) if self.dicts else None
+
+    @staticmethod
+    def content_hash(html: str) -> str:
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def _zstd_dict(self, dict_id: int) -> zstd.ZstdCompressionDict:
+        return zstd.ZstdCompressionDict(self.dicts[dict_id])
+
+    def compress(self, html: str) -> tuple[bytes, int | None]:
+        """ :return: compressed content and id of used dictionary """
+        dict_id = self.current_dict_id
+        if dict_id not in self._compressors:
+            dict_data = self._zstd_dict(dict_id) if dict_id else None
+            self._compressors[dict_id] = zstd.ZstdCompressor(level=self.config.compression_level, dict_data=dict_data)
+        return self._compressors[dict_id].compress(html.encode('utf-8')), dict_id
+
+    def decompress(self, content: bytes, dict_id: int | None) -> str:
+        if dict_id not in self._decompressors:
+            dict_data = self._zstd_dict(dict_id) if dict_id else None
+            self._decompressors[dict_id] = zstd.ZstdDecompressor(dict_data=dict_data)
+        return self._decompressors[dict_id].decompress(content).decode('utf-8')
+
+    def make_row(self, news_id: int, uri: str, html: str) -> dict:
+        """ Compress page into raw_pages row, save it with dao.raw_page.save_pages """
+        content, dict_id = self.compress(html)
+        return {
+            'hash': self.content_hash(html),
+            'news_id': news_id,
+            'uri': uri,
+            'content': content,
+            'dict_id': dict_id,
+        }
+
+    async def train_dict(self, dao: HolderDao) -> int | None:
+        """
+        Train new dictionary on the latest stored pages and save it. Next saved pages will use it.
+
+        :return: id of new dictionary or None if there is not enough samples
+        """
+        pages = await dao.raw_page.get_many(limit=self.config.dict_samples,
+                                            order_by=dao.raw_page.model.id, _desc=True)
+        samples = [self.decompress(page.content, page.dict_id).encode('utf-8') for page in pages]
+        try:
+            trained = zstd.train_dictionary(self.config.dict_size, samples)
+        except zstd.ZstdError as e:
+            logger.warning(f'Dictionary training failed on {len(samples)} samples: {e}')
+            return None
+
+        compression_dict = CompressionDict(data=trained.as_bytes(), samples=len(samples))
+        dao.compression_dict.save_obj(compression_dict)
+        await dao.compression_dict.flush(compression_dict)
+        self.dicts[compression_dict.id] = compression_dict.data
+        logger.info(f'Trained dictionary {compression_dict.id} on {len(samples)} pages')
+        return compression_dict.id
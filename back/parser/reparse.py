@@ -0,0 +1,139 @@
+import asyncio
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from logging import getLogger
+
+from config import Config
+from config.conf_loader import RawStoreConfig
+from config.logger_loader import use_direct_handlers
+from db.base import create_pool
+from db.dao import HolderDao
+from db.dao.stats import hour_bucket, keyword_counts
+from parser.enrichers import Enricher, load_enrichers
+from parser.extractor import extract_news, ExtractionError
+from parser.raw_store import RawHtmlStore
+
+logger = getLogger(__name__)
+
+# set in every worker process by _init_worker
+_worker_store: RawHtmlStore | None = None
+_worker_main_uri: str | None = None
+_worker_enrichers: list[Enricher] = []
+
+
+def _init_worker(store_config: RawStoreConfig, main_uri: str, dicts: dict[int, bytes], enrichers: list[str]):
+    global _worker_store, _worker_main_uri, _worker_enrichers
+    use_direct_handlers()
+    _worker_store = RawHtmlStore(store_config, dicts)
+    _worker_main_uri = main_uri
+    _worker_enrichers = load_enrichers(enrichers)
+
+
+def _reparse_batch(pages: list[tuple[int, bytes, int | None]]) -> tuple[list[dict], list[int]]:
+    """ Runs in worker process: extract and enrich. :return: rows for news and news_ids that failed """
+    rows, failed = [], []
+    for news_id, content, dict_id in pages:
+        html = _worker_store.decompress(content, dict_id)
+        try:
+            rows.append({'news_id': news_id, **extract_news(html, _worker_main_uri), 'enrichment': {}})
+        except ExtractionError:
+            failed.append(news_id)
+        except Exception:
+            logger.exception(f'Extractor crashed on news {news_id}')
+            failed.append(news_id)
+
+    payload = [{key: row[key] for key in ('title', 'image', 'text')} for row in rows]
+    for enricher in _worker_enrichers:
+        try:
+            results = enricher.enrich_batch(payload)
+        except Exception:
+            # best effort, rows are saved without keys of this enricher
+            logger.exception(f'Enricher {enricher.name} failed on news {[row["news_id"] for row in rows]}')
+            continue
+        for row, enrichment in zip(rows, results):
+            row['enrichment'].update(enrichment)
+    return rows, failed
+
+
+async def _update_stats(dao: HolderDao, rows: list[dict], old_state: dict[int, tuple[datetime, dict | None]]):
+    """
+    Keep hourly aggregates in sync with news in the same transaction: inserted news are counted as articles
+    of the hour their page was fetched, keywords of updated ones are replaced in their original hour bucket
+    """
+    inserted = [row for row in rows if row['news_id'] not in old_state]
+    updated = [row for row in rows if row['news_id'] in old_state and old_state[row['news_id']][0]]
+
+    articles = Counter(hour_bucket(row['parsed_at']) for row in inserted)
+    terms = keyword_counts((row['parsed_at'], row['enrichment']) for row in inserted)
+    terms.update(keyword_counts((old_state[row['news_id']][0], row['enrichment']) for row in updated))
+    terms.update(keyword_counts([old_state[row['news_id']] for row in updated], sign=-1))
+    await dao.hourly_news.increment(dict(articles))
+    await dao.hourly_terms.increment(terms)
+
+
+async def launch_reparse(config: Config, since: datetime = None, workers: int = None):
+    """
+    Re-run extraction and enrichers over stored raw HTML and bulk update news, without network.
+    Every chunk of pages is split between worker processes, results are saved in one transaction per chunk.
+    """
+    workers = workers or config.raw_store.reparse_workers or os.cpu_count()
+    chunk_size = config.raw_store.reparse_chunk_size
+    pool = create_pool(config.db)
+
+    async with pool() as db_session:
+        store = await RawHtmlStore.load(config.raw_store, HolderDao(db_session))
+
+    loop = asyncio.get_running_loop()
+    last_news_id, updated, inserted, failed = 0, 0, 0, []
+    logger.info(f'Reparse started, workers: {workers}')
+    executor = ProcessPoolExecutor(max_workers=workers,
+                                   initializer=_init_worker,
+                                   initargs=(config.raw_store, config.parser.main_uri, store.dicts,
+                                             config.pipeline.enrichers))
+    with executor:
+        while True:
+            async with pool() as db_session:
+                dao = HolderDao(db_session)
+                pages = await dao.raw_page.get_latest_pages(after_news_id=last_news_id, limit=chunk_size, since=since)
+                if not pages:
+                    break
+                last_news_id = pages[-1].news_id
+
+                batch = [(page.news_id, page.content, page.dict_id) for page in pages]
+                step = -(-len(batch) // workers)
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(executor, _reparse_batch, batch[i:i + step])
+                    for i in range(0, len(batch), step)
+                ))
+                rows = [row for batch_rows, _ in results for row in batch_rows]
+                for _, batch_failed in results:
+                    failed.extend(batch_failed)
+
+                old_state = await dao.news.get_stats_state([row['news_id'] for row in rows])
+                # inserted news are dated by page capture, not by reparse run, same for their stats buckets
+                fetched_at = {page.news_id: page.fetched_at or datetime.now() for page in pages}
+                for row in rows:
+                    if row['news_id'] not in old_state:
+                        row['parsed_at'] = fetched_at[row['news_id']]
+                chunk_updated, chunk_inserted = await dao.news.bulk_save_by_news_id(rows, existing=set(old_state))
+                await _update_stats(dao, rows, old_state)
+                await dao.commit()
+                updated += chunk_updated
+                inserted += chunk_inserted
+                logger.info(f'Reparsed up to news_id {last_news_id}: updated {updated}, inserted {inserted}')
+
+    if failed:
+        logger.warning(f'Extraction failed for {len(failed)} pages, first ids: {failed[:20]}')
+    logger.info(f'Reparse complete! Updated: {updated}, inserted: {inserted}, failed: {len(failed)}')
+
+
+async def launch_train_dict(config: Config):
+    """ Train new zstd dictionary on stored pages """
+    pool = create_pool(config.db)
+    async with pool() as db_session:
+        dao = HolderDao(db_session)
+        store = await RawHtmlStore.load(config.raw_store, dao)
+        await store.train_dict(dao)
+        await dao.commit()
@@ -3,24 +3,43 @@ from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config import Config
+from config.reloader import ConfigHolder
+from db.base import create_pool, dispose_pool
 from parser import launch_parser
 
 from logging import getLogger
 
 logger = getLogger(__name__)
 
+PARSER_JOB_ID = 'parser'
 
-def init_scheduler(config: Config):
-    """ Periodic task controller """
+
+def init_scheduler(config_holder: ConfigHolder[Config]) -> AsyncIOScheduler:
+    """ Periodic task controller. Follows config reloads: new parse interval and db settings apply live """
 
     scheduler_async = AsyncIOScheduler()
+    state = {'pool': create_pool(config_holder.current.db)}
+
+    async def run_parser():
+        await launch_parser(config=config_holder.current, pool=state['pool'])
+
+    async def on_config_change(old: Config, new: Config):
+        if old.parser.parse_interval_sec != new.parser.parse_interval_sec:
+            scheduler_async.reschedule_job(PARSER_JOB_ID, trigger='interval', seconds=new.parser.parse_interval_sec)
+            logger.info(f'Parser rescheduled, interval: {new.parser.parse_interval_sec} sec')
+        if old.db != new.db:
+            old_pool, state['pool'] = state['pool'], create_pool(new.db)
+            await dispose_pool(old_pool)
+            logger.info('Parser db pool recreated')
 
     scheduler_async.add_job(
-        func=launch_parser,
+        func=run_parser,
         trigger='interval',
-        seconds=config.parser.parse_interval_sec,
+        id=PARSER_JOB_ID,
+        seconds=config_holder.current.parser.parse_interval_sec,
         next_run_time=datetime.now(),
-        kwargs={'config': config}
     )
+    config_holder.subscribe(on_config_change)
     logger.warning('BEFORE LAUNCH')
     scheduler_async.start()
+    return scheduler_async
@@ -0,0 +1,32 @@
+""" Offline re-parse of stored raw HTML. Usage:
+    python reparse.py                       - re-extract all stored pages
+    python reparse.py --since 2023-12-01    - only pages fetched since date
+    python reparse.py --train-dict          - train new zstd dictionary on stored pages
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from config import Config, setup_logging
+from parser.reparse import launch_reparse, launch_train_dict
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description='Re-run news extraction over stored raw HTML')
+    arg_parser.add_argument('--since', type=datetime.fromisoformat, default=None,
+                            help='only pages fetched since this date (ISO format)')
+    arg_parser.add_argument('--workers', type=int, default=None,
+                            help='number of worker processes, default from config or all CPU cores')
+    arg_parser.add_argument('--train-dict', action='store_true',
+                            help='train new compression dictionary instead of reparse')
+    return arg_parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    setup_logging()
+    config = Config()
+    if args.train_dict:
+        asyncio.run(launch_train_dict(config))
+    else:
+        asyncio.run(launch_reparse(config, since=args.since, workers=args.workers))
@@ -0,0 +1,19 @@
+""" Crawler entry point: periodic parsing of news.am, follows config reloads """
+import asyncio
+from logging import getLogger
+
+from config import setup_logging, get_config_holder
+from periodic_tasks import init_scheduler
+
+logger = getLogger(__name__)
+
+
+async def main():
+    config_holder = get_config_holder()
+    init_scheduler(config_holder=config_holder)
+    await config_holder.watch()
+
+
+if __name__ == '__main__':
+    setup_logging()
+    asyncio.run(main())